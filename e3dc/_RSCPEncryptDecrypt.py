@@ -61,6 +61,26 @@ class RSCPEncryptDecrypt:
         self.encryptIV = encText[-BLOCK_SIZE:]
         return encText
 
+    def peekDecrypt(self, encText: bytes) -> bytes:
+        """Method to decrypt the first block of encrypted text without changing the decryption state.
+
+        Only valid if all previously decrypted data was a multiple of BLOCK_SIZE.
+        """
+        if self.oldDecrypt != b"":
+            iv = self.oldDecrypt[-BLOCK_SIZE:]
+        else:
+            iv = self.decryptIV
+        decryptor = RijndaelCbc(
+            self.key,
+            iv,
+            padding=ZeroPadding(BLOCK_SIZE),
+            block_size=BLOCK_SIZE,
+        )
+        # restore the zeros stripped by the padding
+        return decryptor.decrypt(  # pyright: ignore [reportUnknownMemberType]
+            encText[:BLOCK_SIZE]
+        ).ljust(BLOCK_SIZE, b"\x00")
+
     def decrypt(
         self, encText: bytes, previouslyProcessedData: int | None = None
     ) -> bytes:
@@ -20,13 +20,21 @@ from ._e3dc_rscp_local import (
     RSCPNotAvailableError,
 )
 from ._e3dc_rscp_web import E3DC_RSCP_web
-from ._rscpLib import rscpFindTag, rscpFindTagIndex
+from ._rscpLib import (
+    rscpFindTag,
+    rscpFindTagIndex,
+    rscpFindTagIndexInMap,
+    rscpTagMap,
+)
 from ._rscpTags import RscpTag, RscpType, getStrPowermeterType, getStrPviType
 
 REMOTE_ADDRESS = "https://s10.e3dc.com/s10/phpcmd/cmd.php"
 REQUEST_INTERVAL_SEC = 10  # minimum interval between requests
 REQUEST_INTERVAL_SEC_LOCAL = 1  # minimum interval between requests
 
+# consumption (int16) and energy (int32) at the start of the wallbox extern data
+_WB_EXTERN_ENERGY_STRUCT = struct.Struct("<hi")
+
 
 class AuthenticationError(Exception):
     """Class for Authentication Error Exception."""
@@ -1055,14 +1063,18 @@ class E3DC:
         extern_data_sun = rscpFindTag(req, RscpTag.WB_EXTERN_DATA_SUN)
         if extern_data_sun is not None:
             extern_data = rscpFindTagIndex(extern_data_sun, RscpTag.WB_EXTERN_DATA)
-            outObj["consumptionSun"] = struct.unpack("h", extern_data[0:2])[0]
-            outObj["energySun"] = struct.unpack("i", extern_data[2:6])[0]
+            (
+                outObj["consumptionSun"],
+                outObj["energySun"],
+            ) = _WB_EXTERN_ENERGY_STRUCT.unpack_from(extern_data)
 
         extern_data_net = rscpFindTag(req, RscpTag.WB_EXTERN_DATA_NET)
         if extern_data_net is not None:
             extern_data = rscpFindTagIndex(extern_data_net, RscpTag.WB_EXTERN_DATA)
-            outObj["consumptionNet"] = struct.unpack("h", extern_data[0:2])[0]
-            outObj["energyNet"] = struct.unpack("i", extern_data[2:6])[0]
+            (
+                outObj["consumptionNet"],
+                outObj["energyNet"],
+            ) = _WB_EXTERN_ENERGY_STRUCT.unpack_from(extern_data)
 
         if "energySun" in outObj and "energyNet" in outObj:
             outObj["energyAll"] = outObj["energyNet"] + outObj["energySun"]
@@ -1463,56 +1475,69 @@ class E3DC:
             keepAlive=True,
         )
 
-        dcbCount = rscpFindTagIndex(req, RscpTag.BAT_DCB_COUNT)
+        batTags = rscpTagMap(req)
+        dcbCount = rscpFindTagIndexInMap(batTags, RscpTag.BAT_DCB_COUNT)
         deviceStateContainer = rscpFindTag(req, RscpTag.BAT_DEVICE_STATE)
 
         outObj: Dict[str, Any] = {
-            "asoc": rscpFindTagIndex(req, RscpTag.BAT_ASOC),
-            "chargeCycles": rscpFindTagIndex(req, RscpTag.BAT_CHARGE_CYCLES),
-            "current": rscpFindTagIndex(req, RscpTag.BAT_CURRENT),
+            "asoc": rscpFindTagIndexInMap(batTags, RscpTag.BAT_ASOC),
+            "chargeCycles": rscpFindTagIndexInMap(batTags, RscpTag.BAT_CHARGE_CYCLES),
+            "current": rscpFindTagIndexInMap(batTags, RscpTag.BAT_CURRENT),
             "dcbCount": dcbCount,
             "dcbs": {},
-            "designCapacity": rscpFindTagIndex(req, RscpTag.BAT_DESIGN_CAPACITY),
+            "designCapacity": rscpFindTagIndexInMap(
+                batTags, RscpTag.BAT_DESIGN_CAPACITY
+            ),
             "deviceConnected": rscpFindTagIndex(
                 deviceStateContainer, RscpTag.BAT_DEVICE_CONNECTED
             ),
             "deviceInService": rscpFindTagIndex(
                 deviceStateContainer, RscpTag.BAT_DEVICE_IN_SERVICE
             ),
-            "deviceName": rscpFindTagIndex(req, RscpTag.BAT_DEVICE_NAME),
+            "deviceName": rscpFindTagIndexInMap(batTags, RscpTag.BAT_DEVICE_NAME),
             "deviceWorking": rscpFindTagIndex(
                 deviceStateContainer, RscpTag.BAT_DEVICE_WORKING
             ),
-            "eodVoltage": rscpFindTagIndex(req, RscpTag.BAT_EOD_VOLTAGE),
-            "errorCode": rscpFindTagIndex(req, RscpTag.BAT_ERROR_CODE),
-            "fcc": rscpFindTagIndex(req, RscpTag.BAT_FCC),
+            "eodVoltage": rscpFindTagIndexInMap(batTags, RscpTag.BAT_EOD_VOLTAGE),
+            "errorCode": rscpFindTagIndexInMap(batTags, RscpTag.BAT_ERROR_CODE),
+            "fcc": rscpFindTagIndexInMap(batTags, RscpTag.BAT_FCC),
             "index": batIndex,
-            "maxBatVoltage": rscpFindTagIndex(req, RscpTag.BAT_MAX_BAT_VOLTAGE),
-            "maxChargeCurrent": rscpFindTagIndex(req, RscpTag.BAT_MAX_CHARGE_CURRENT),
-            "maxDischargeCurrent": rscpFindTagIndex(
-                req, RscpTag.BAT_MAX_DISCHARGE_CURRENT
+            "maxBatVoltage": rscpFindTagIndexInMap(
+                batTags, RscpTag.BAT_MAX_BAT_VOLTAGE
+            ),
+            "maxChargeCurrent": rscpFindTagIndexInMap(
+                batTags, RscpTag.BAT_MAX_CHARGE_CURRENT
+            ),
+            "maxDischargeCurrent": rscpFindTagIndexInMap(
+                batTags, RscpTag.BAT_MAX_DISCHARGE_CURRENT
+            ),
+            "maxDcbCellTemp": rscpFindTagIndexInMap(
+                batTags, RscpTag.BAT_MAX_DCB_CELL_TEMPERATURE
             ),
-            "maxDcbCellTemp": rscpFindTagIndex(
-                req, RscpTag.BAT_MAX_DCB_CELL_TEMPERATURE
+            "minDcbCellTemp": rscpFindTagIndexInMap(
+                batTags, RscpTag.BAT_MIN_DCB_CELL_TEMPERATURE
             ),
-            "minDcbCellTemp": rscpFindTagIndex(
-                req, RscpTag.BAT_MIN_DCB_CELL_TEMPERATURE
+            "moduleVoltage": rscpFindTagIndexInMap(batTags, RscpTag.BAT_MODULE_VOLTAGE),
+            "rc": rscpFindTagIndexInMap(batTags, RscpTag.BAT_RC),
+            "readyForShutdown": rscpFindTagIndexInMap(
+                batTags, RscpTag.BAT_READY_FOR_SHUTDOWN
             ),
-            "moduleVoltage": rscpFindTagIndex(req, RscpTag.BAT_MODULE_VOLTAGE),
-            "rc": rscpFindTagIndex(req, RscpTag.BAT_RC),
-            "readyForShutdown": rscpFindTagIndex(req, RscpTag.BAT_READY_FOR_SHUTDOWN),
-            "rsoc": rscpFindTagIndex(req, RscpTag.BAT_RSOC),
-            "rsocReal": rscpFindTagIndex(req, RscpTag.BAT_RSOC_REAL),
-            "statusCode": rscpFindTagIndex(req, RscpTag.BAT_STATUS_CODE),
-            "terminalVoltage": rscpFindTagIndex(req, RscpTag.BAT_TERMINAL_VOLTAGE),
-            "totalUseTime": rscpFindTagIndex(req, RscpTag.BAT_TOTAL_USE_TIME),
-            "totalDischargeTime": rscpFindTagIndex(
-                req, RscpTag.BAT_TOTAL_DISCHARGE_TIME
+            "rsoc": rscpFindTagIndexInMap(batTags, RscpTag.BAT_RSOC),
+            "rsocReal": rscpFindTagIndexInMap(batTags, RscpTag.BAT_RSOC_REAL),
+            "statusCode": rscpFindTagIndexInMap(batTags, RscpTag.BAT_STATUS_CODE),
+            "terminalVoltage": rscpFindTagIndexInMap(
+                batTags, RscpTag.BAT_TERMINAL_VOLTAGE
             ),
-            "trainingMode": rscpFindTagIndex(req, RscpTag.BAT_TRAINING_MODE),
-            "usuableCapacity": rscpFindTagIndex(req, RscpTag.BAT_USABLE_CAPACITY),
-            "usuableRemainingCapacity": rscpFindTagIndex(
-                req, RscpTag.BAT_USABLE_REMAINING_CAPACITY
+            "totalUseTime": rscpFindTagIndexInMap(batTags, RscpTag.BAT_TOTAL_USE_TIME),
+            "totalDischargeTime": rscpFindTagIndexInMap(
+                batTags, RscpTag.BAT_TOTAL_DISCHARGE_TIME
+            ),
+            "trainingMode": rscpFindTagIndexInMap(batTags, RscpTag.BAT_TRAINING_MODE),
+            "usuableCapacity": rscpFindTagIndexInMap(
+                batTags, RscpTag.BAT_USABLE_CAPACITY
+            ),
+            "usuableRemainingCapacity": rscpFindTagIndexInMap(
+                batTags, RscpTag.BAT_USABLE_REMAINING_CAPACITY
             ),
         }
 
@@ -1549,6 +1574,8 @@ class E3DC:
             if info is None or len(info) < 3 or info[1] == "Error":
                 continue
 
+            dcbTags = rscpTagMap(info)
+
             # Initialize default values for DCB
             sensorCount = 0
             temperatures: List[float] = []
@@ -1563,7 +1590,7 @@ class E3DC:
                 and temperatures_raw[1] != "Error"
             ):
                 temperatures_data = rscpFindTagIndex(temperatures_raw, RscpTag.BAT_DATA)
-                sensorCount = rscpFindTagIndex(info, RscpTag.BAT_DCB_NR_SENSOR)
+                sensorCount = rscpFindTagIndexInMap(dcbTags, RscpTag.BAT_DCB_NR_SENSOR)
                 for sensor in range(0, sensorCount):
                     temperatures.append(temperatures_data[sensor][2])
 
@@ -1579,69 +1606,79 @@ class E3DC:
                     voltages.append(cell_voltage[2])
 
             dcbobj: Dict[str, Any] = {
-                "current": rscpFindTagIndex(info, RscpTag.BAT_DCB_CURRENT),
-                "currentAvg30s": rscpFindTagIndex(
-                    info, RscpTag.BAT_DCB_CURRENT_AVG_30S
+                "current": rscpFindTagIndexInMap(dcbTags, RscpTag.BAT_DCB_CURRENT),
+                "currentAvg30s": rscpFindTagIndexInMap(
+                    dcbTags, RscpTag.BAT_DCB_CURRENT_AVG_30S
+                ),
+                "cycleCount": rscpFindTagIndexInMap(
+                    dcbTags, RscpTag.BAT_DCB_CYCLE_COUNT
                 ),
-                "cycleCount": rscpFindTagIndex(info, RscpTag.BAT_DCB_CYCLE_COUNT),
-                "designCapacity": rscpFindTagIndex(
-                    info, RscpTag.BAT_DCB_DESIGN_CAPACITY
+                "designCapacity": rscpFindTagIndexInMap(
+                    dcbTags, RscpTag.BAT_DCB_DESIGN_CAPACITY
                 ),
-                "designVoltage": rscpFindTagIndex(info, RscpTag.BAT_DCB_DESIGN_VOLTAGE),
-                "deviceName": rscpFindTagIndex(info, RscpTag.BAT_DCB_DEVICE_NAME),
-                "endOfDischarge": rscpFindTagIndex(
-                    info, RscpTag.BAT_DCB_END_OF_DISCHARGE
+                "designVoltage": rscpFindTagIndexInMap(
+                    dcbTags, RscpTag.BAT_DCB_DESIGN_VOLTAGE
                 ),
-                "error": rscpFindTagIndex(info, RscpTag.BAT_DCB_ERROR),
-                "fullChargeCapacity": rscpFindTagIndex(
-                    info, RscpTag.BAT_DCB_FULL_CHARGE_CAPACITY
+                "deviceName": rscpFindTagIndexInMap(
+                    dcbTags, RscpTag.BAT_DCB_DEVICE_NAME
                 ),
-                "fwVersion": rscpFindTagIndex(info, RscpTag.BAT_DCB_FW_VERSION),
-                "manufactureDate": rscpFindTagIndex(
-                    info, RscpTag.BAT_DCB_MANUFACTURE_DATE
+                "endOfDischarge": rscpFindTagIndexInMap(
+                    dcbTags, RscpTag.BAT_DCB_END_OF_DISCHARGE
                 ),
-                "manufactureName": rscpFindTagIndex(
-                    info, RscpTag.BAT_DCB_MANUFACTURE_NAME
+                "error": rscpFindTagIndexInMap(dcbTags, RscpTag.BAT_DCB_ERROR),
+                "fullChargeCapacity": rscpFindTagIndexInMap(
+                    dcbTags, RscpTag.BAT_DCB_FULL_CHARGE_CAPACITY
                 ),
-                "maxChargeCurrent": rscpFindTagIndex(
-                    info, RscpTag.BAT_DCB_MAX_CHARGE_CURRENT
+                "fwVersion": rscpFindTagIndexInMap(dcbTags, RscpTag.BAT_DCB_FW_VERSION),
+                "manufactureDate": rscpFindTagIndexInMap(
+                    dcbTags, RscpTag.BAT_DCB_MANUFACTURE_DATE
                 ),
-                "maxChargeTemperature": rscpFindTagIndex(
-                    info, RscpTag.BAT_DCB_CHARGE_HIGH_TEMPERATURE
+                "manufactureName": rscpFindTagIndexInMap(
+                    dcbTags, RscpTag.BAT_DCB_MANUFACTURE_NAME
                 ),
-                "maxChargeVoltage": rscpFindTagIndex(
-                    info, RscpTag.BAT_DCB_MAX_CHARGE_VOLTAGE
+                "maxChargeCurrent": rscpFindTagIndexInMap(
+                    dcbTags, RscpTag.BAT_DCB_MAX_CHARGE_CURRENT
                 ),
-                "maxDischargeCurrent": rscpFindTagIndex(
-                    info, RscpTag.BAT_DCB_MAX_DISCHARGE_CURRENT
+                "maxChargeTemperature": rscpFindTagIndexInMap(
+                    dcbTags, RscpTag.BAT_DCB_CHARGE_HIGH_TEMPERATURE
                 ),
-                "minChargeTemperature": rscpFindTagIndex(
-                    info, RscpTag.BAT_DCB_CHARGE_LOW_TEMPERATURE
+                "maxChargeVoltage": rscpFindTagIndexInMap(
+                    dcbTags, RscpTag.BAT_DCB_MAX_CHARGE_VOLTAGE
                 ),
-                "parallelCellCount": rscpFindTagIndex(
-                    info, RscpTag.BAT_DCB_NR_PARALLEL_CELL
+                "maxDischargeCurrent": rscpFindTagIndexInMap(
+                    dcbTags, RscpTag.BAT_DCB_MAX_DISCHARGE_CURRENT
+                ),
+                "minChargeTemperature": rscpFindTagIndexInMap(
+                    dcbTags, RscpTag.BAT_DCB_CHARGE_LOW_TEMPERATURE
+                ),
+                "parallelCellCount": rscpFindTagIndexInMap(
+                    dcbTags, RscpTag.BAT_DCB_NR_PARALLEL_CELL
                 ),
                 "sensorCount": sensorCount,
                 "seriesCellCount": seriesCellCount,
-                "pcbVersion": rscpFindTagIndex(info, RscpTag.BAT_DCB_PCB_VERSION),
-                "protocolVersion": rscpFindTagIndex(
-                    info, RscpTag.BAT_DCB_PROTOCOL_VERSION
+                "pcbVersion": rscpFindTagIndexInMap(
+                    dcbTags, RscpTag.BAT_DCB_PCB_VERSION
+                ),
+                "protocolVersion": rscpFindTagIndexInMap(
+                    dcbTags, RscpTag.BAT_DCB_PROTOCOL_VERSION
+                ),
+                "remainingCapacity": rscpFindTagIndexInMap(
+                    dcbTags, RscpTag.BAT_DCB_REMAINING_CAPACITY
                 ),
-                "remainingCapacity": rscpFindTagIndex(
-                    info, RscpTag.BAT_DCB_REMAINING_CAPACITY
+                "serialCode": rscpFindTagIndexInMap(
+                    dcbTags, RscpTag.BAT_DCB_SERIALCODE
                 ),
-                "serialCode": rscpFindTagIndex(info, RscpTag.BAT_DCB_SERIALCODE),
-                "serialNo": rscpFindTagIndex(info, RscpTag.BAT_DCB_SERIALNO),
-                "soc": rscpFindTagIndex(info, RscpTag.BAT_DCB_SOC),
-                "soh": rscpFindTagIndex(info, RscpTag.BAT_DCB_SOH),
-                "status": rscpFindTagIndex(info, RscpTag.BAT_DCB_STATUS),
+                "serialNo": rscpFindTagIndexInMap(dcbTags, RscpTag.BAT_DCB_SERIALNO),
+                "soc": rscpFindTagIndexInMap(dcbTags, RscpTag.BAT_DCB_SOC),
+                "soh": rscpFindTagIndexInMap(dcbTags, RscpTag.BAT_DCB_SOH),
+                "status": rscpFindTagIndexInMap(dcbTags, RscpTag.BAT_DCB_STATUS),
                 "temperatures": temperatures,
-                "voltage": rscpFindTagIndex(info, RscpTag.BAT_DCB_VOLTAGE),
-                "voltageAvg30s": rscpFindTagIndex(
-                    info, RscpTag.BAT_DCB_VOLTAGE_AVG_30S
+                "voltage": rscpFindTagIndexInMap(dcbTags, RscpTag.BAT_DCB_VOLTAGE),
+                "voltageAvg30s": rscpFindTagIndexInMap(
+                    dcbTags, RscpTag.BAT_DCB_VOLTAGE_AVG_30S
                 ),
                 "voltages": voltages,
-                "warning": rscpFindTagIndex(info, RscpTag.BAT_DCB_WARNING),
+                "warning": rscpFindTagIndexInMap(dcbTags, RscpTag.BAT_DCB_WARNING),
             }
             outObj["dcbs"].update({dcb: dcbobj})  # type: ignore
         return outObj
@@ -7,10 +7,16 @@
 from __future__ import annotations  # required for python < 3.9
 
 import socket
-from typing import Any, Tuple
-
-from ._RSCPEncryptDecrypt import RSCPEncryptDecrypt
-from ._rscpLib import rscpDecode, rscpEncode, rscpFrame
+from typing import Any, List, Tuple
+
+from ._RSCPEncryptDecrypt import BLOCK_SIZE, RSCPEncryptDecrypt
+from ._rscpLib import (
+    rscpDecode,
+    rscpEncode,
+    rscpFrame,
+    rscpFrameDecode,
+    rscpFrameLength,
+)
 from ._rscpTags import RscpError, RscpTag, RscpType
 
 PORT = 5033
@@ -61,20 +67,41 @@ class E3DC_RSCP_local:
         self.connected: bool = False
         self.encdec: RSCPEncryptDecrypt
         self.processedData = None
+        self.receiveBuffer = bytearray()
 
     def _send(
         self, plainMsg: Tuple[str | int | RscpTag, str | int | RscpType, Any]
     ) -> None:
-        sendData = rscpFrame(rscpEncode(plainMsg))
+        self._sendFrame(rscpFrame(rscpEncode(plainMsg)))
+
+    def _sendFrame(self, sendData: bytes) -> None:
         encData = self.encdec.encrypt(sendData)
-        self.socket.send(encData)
+        self.socket.sendall(encData)
 
     def _receive(self):
-        data = self.socket.recv(BUFFER_SIZE)
-        if len(data) == 0:
-            raise RSCPKeyError
-        decData = rscpDecode(self.encdec.decrypt(data))[0]
-        return decData
+        return rscpDecode(self._receiveFrame())[0]
+
+    def _receiveFrame(self) -> bytes:
+        # receive until a complete encrypted frame is buffered, its length is
+        # taken from the frame header in the first block
+        frameLen = 0
+        encLen = None
+        while encLen is None or len(self.receiveBuffer) < encLen:
+            if encLen is None and len(self.receiveBuffer) >= BLOCK_SIZE:
+                header = self.encdec.peekDecrypt(bytes(self.receiveBuffer[:BLOCK_SIZE]))
+                frameLen = rscpFrameLength(header)
+                encLen = (frameLen + BLOCK_SIZE - 1) // BLOCK_SIZE * BLOCK_SIZE
+                continue
+            data = self.socket.recv(BUFFER_SIZE)
+            if len(data) == 0:
+                raise RSCPKeyError
+            self.receiveBuffer += data
+
+        encData = bytes(self.receiveBuffer[:encLen])
+        del self.receiveBuffer[:encLen]
+        # the zero padding removal also strips zeros which belong to the frame,
+        # e.g. the last bytes of the crc
+        return self.encdec.decrypt(encData).ljust(frameLen, b"\x00")
 
     def sendCommand(
         self, plainMsg: Tuple[str | int | RscpTag, str | int | RscpType, Any]
@@ -107,6 +134,47 @@ class E3DC_RSCP_local:
             self.disconnect()
             raise CommunicationError
 
+        self._checkResponse(receive)
+        return receive
+
+    def sendRequests(
+        self, plainMsgs: List[Tuple[str | int | RscpTag, str | int | RscpType, Any]]
+    ) -> List[Tuple[str | int | RscpTag, str | int | RscpType, Any]]:
+        """Sending several RSCP requests in a single frame.
+
+        Args:
+            plainMsgs (list): plain messages
+
+        Returns:
+            list: received messages, in the same order as the requests
+        """
+        if len(plainMsgs) == 0:
+            return []
+
+        receives: List[Tuple[str | int | RscpTag, str | int | RscpType, Any]] = []
+        try:
+            self._sendFrame(rscpFrame(b"".join(rscpEncode(m) for m in plainMsgs)))
+            data = rscpFrameDecode(self._receiveFrame())[0]
+            # the answers come back together in one frame as well
+            offset = 0
+            while offset < len(data):
+                receive, size = rscpDecode(data, offset)
+                offset += size
+                receives.append(receive)
+        except RSCPKeyError:
+            self.disconnect()
+            raise
+        except Exception:
+            self.disconnect()
+            raise CommunicationError
+
+        for receive in receives:
+            self._checkResponse(receive)
+        return receives
+
+    def _checkResponse(
+        self, receive: Tuple[str | int | RscpTag, str | int | RscpType, Any]
+    ) -> None:
         if receive[1] == "Error":
             self.disconnect()
             if receive[2] == RscpError.RSCP_ERR_ACCESS_DENIED.name:
@@ -115,15 +183,20 @@ class E3DC_RSCP_local:
                 raise RSCPNotAvailableError
             else:
                 raise CommunicationError(receive[2])
-        return receive
 
     def connect(self) -> None:
         """Establishes connection to the E3DC system."""
+        if self.connected and self._isSocketAlive():
+            return  # the authenticated session can be reused
+
         try:
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            # requests are small, send them immediately instead of waiting for ACKs
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             self.socket.settimeout(5)
             self.socket.connect((self.ip, PORT))
             self.processedData = None
+            self.receiveBuffer = bytearray()
             self.connected = True
         except Exception:
             self.disconnect()
@@ -147,10 +220,19 @@ class E3DC_RSCP_local:
 
     def disconnect(self) -> None:
         """Disconnects from the E3DC system."""
+        try:
+            self.socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass  # socket was not connected
         self.socket.close()
-        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.connected = False
 
+    def _isSocketAlive(self) -> bool:
+        try:
+            return self.socket.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0
+        except OSError:
+            return False
+
     def isConnected(self) -> bool:
         """Validate connection status.
 
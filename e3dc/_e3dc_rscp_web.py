@@ -5,12 +5,18 @@
 # Licensed under a MIT license. See LICENSE for details
 from __future__ import annotations  # required for python < 3.9
 
+import asyncio
+import collections
+import concurrent.futures
 import datetime
+import functools
 import hashlib
+import itertools
+import socket
 import struct
 import threading
 import time
-from typing import Any, Callable, Tuple
+from typing import Any, Callable, Deque, Dict, List, Tuple
 
 import tzlocal
 from websocket import ABNF, WebSocketApp
@@ -18,12 +24,12 @@ from websocket import ABNF, WebSocketApp
 from ._rscpLib import (
     rscpDecode,
     rscpEncode,
-    rscpFindTag,
     rscpFindTagIndex,
+    rscpFindTags,
     rscpFrame,
     rscpFrameDecode,
 )
-from ._rscpTags import RscpTag, RscpType, getRscpTag
+from ._rscpTags import RscpTag, RscpType, getRscpTagOrNone
 
 """
  The connection works the following way: (> outgoing, < incoming)
@@ -49,6 +55,10 @@ from ._rscpTags import RscpTag, RscpType, getRscpTag
 
 REMOTE_ADDRESS = "wss://s10.e3dc.com/ws"
 
+_TS_STRUCT = struct.Struct("<dI")  # seconds as double, milliseconds as Uint32
+# set in the tag of a response, the other bits are the tag of the request
+_RESPONSE_TAG_FLAG = 0x00800000
+
 
 class SocketNotReady(Exception):
     """Class for Socket Not Ready Exception."""
@@ -62,22 +72,94 @@ class RequestTimeoutError(Exception):
     pass
 
 
+def _responseTagValue(tag: str | int | RscpTag) -> int | None:
+    """The tag value of the response to a request with the given tag.
+
+    Returns None for tag names unknown to this library.
+    """
+    if isinstance(tag, int):
+        return tag | _RESPONSE_TAG_FLAG
+    rscpTag = getRscpTagOrNone(tag)
+    if rscpTag is None:
+        return None
+    return rscpTag.value | _RESPONSE_TAG_FLAG
+
+
+class PendingRequest:
+    """A request sent to the E3DC system which is waiting for its response."""
+
+    def __init__(
+        self,
+        callback: (
+            Callable[[Tuple[str | int | RscpTag, str | int | RscpType, Any]], None]
+            | None
+        ) = None,
+        tag: str | int | RscpTag | None = None,
+    ):
+        """Constructor of a pending request.
+
+        Args:
+            callback (Callable, optional): called with the response when it arrives
+            tag (str | int | RscpTag, optional): the tag of the request, used to match
+                the response. Without it, the request takes any response.
+        """
+        self.callback = callback
+        self.responseTag = _responseTagValue(tag) if tag is not None else None
+        self.result: Tuple[str | int | RscpTag, str | int | RscpType, Any] | None = None
+        self.event = threading.Event()
+        # set when the request timed out, its late response is then thrown away
+        self.abandoned = False
+
+    def expects(self, responseTag: int | None) -> bool:
+        """Check if a response with the given tag value can answer this request."""
+        return (
+            self.responseTag is None
+            or responseTag is None
+            or self.responseTag == responseTag
+        )
+
+    def complete(self, msg: Tuple[str | int | RscpTag, str | int | RscpType, Any]):
+        """Store the response, call the callback and wake up waiting threads."""
+        self.result = msg
+        if self.callback is not None:
+            self.callback(msg)
+        self.event.set()
+
+
 def calcTimeZone():
     """Method to calculate time zone.
 
+    The result is cached for the current hour, as it only changes with daylight saving time.
+
     Returns:
         str: timezone string
         int: UTC diff
     """
-    localtz = tzlocal.get_localzone()
+    return _calcTimeZoneForHour(int(time.time()) // 3600)
+
+
+@functools.lru_cache(maxsize=1)
+def _getLocalTimeZone() -> datetime.tzinfo:
+    # reads /etc/localtime, so only look it up once, and not at import time
+    return tzlocal.get_localzone()
+
+
+@functools.lru_cache(maxsize=1)
+def _calcTimeZoneForHour(_hour: int) -> Tuple[str, float]:
     naiveNow = datetime.datetime.now()
-    utcDiff = localtz.utcoffset(naiveNow)  # this is a timedelta
+    utcDiff = _getLocalTimeZone().utcoffset(naiveNow)  # this is a timedelta
     utcDiffS = utcDiff.total_seconds() if utcDiff else 0
     utcDiffH = int(utcDiffS / 60 / 60)  # this is local - utc (eg 2 = UTC+2)
     TIMEZONE_STR = "GMT" + ("+" if utcDiffH > 0 else "-") + str(abs(utcDiffH))
     return TIMEZONE_STR, utcDiffS
 
 
+@functools.lru_cache(maxsize=2)
+def _encodeTimeZone(timezoneStr: str) -> bytes:
+    # the answer only changes with daylight saving time, like the time zone itself
+    return rscpEncode(RscpTag.INFO_TIME_ZONE, RscpType.CString, timezoneStr)
+
+
 def timestampEncode(ts: float):
     """Method to encode timestamp.
 
@@ -85,9 +167,8 @@ def timestampEncode(ts: float):
         ts (time): timestamp
 
     """
-    sec = float(int(ts))
-    ms = int((ts - sec) * 1000)
-    return struct.pack("<dI", sec, ms)
+    sec = int(ts)
+    return _TS_STRUCT.pack(sec, int((ts - sec) * 1000))
 
 
 class E3DC_RSCP_web:
@@ -95,6 +176,32 @@ class E3DC_RSCP_web:
 
     TIMEOUT = 10  # timeout in sec
 
+    # no Nagle delay for the small frames, keepalive to notice a dead server
+    _SOCKET_OPTIONS = (
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+    )
+
+    # answers to INFO requests which never change, encoded once at import
+    _STATIC_INFO_RESPONSES: Dict[RscpTag, bytes] = {
+        RscpTag.INFO_REQ_IP_ADDRESS: rscpEncode(
+            RscpTag.INFO_IP_ADDRESS, RscpType.CString, "0.0.0.0"
+        ),
+        RscpTag.INFO_REQ_SUBNET_MASK: rscpEncode(
+            RscpTag.INFO_SUBNET_MASK, RscpType.CString, "0.0.0.0"
+        ),
+        RscpTag.INFO_REQ_GATEWAY: rscpEncode(
+            RscpTag.INFO_GATEWAY, RscpType.CString, "0.0.0.0"
+        ),
+        RscpTag.INFO_REQ_DNS: rscpEncode(RscpTag.INFO_DNS, RscpType.CString, "0.0.0.0"),
+        RscpTag.INFO_REQ_DHCP_STATUS: rscpEncode(
+            RscpTag.INFO_DHCP_STATUS, RscpType.Bool, "false"
+        ),
+        RscpTag.INFO_REQ_A35_SERIAL_NUMBER: rscpEncode(
+            RscpTag.INFO_A35_SERIAL_NUMBER, RscpType.CString, "123456"
+        ),
+    }
+
     def __init__(
         self,
         username: str,
@@ -120,10 +227,20 @@ class E3DC_RSCP_web:
         self.serialNumberWithPrefix = serialNumberWithPrefix.encode("utf-8")
         self.ws = WebSocketApp(
             REMOTE_ADDRESS,
-            on_message=lambda _, msg: self.on_message(msg),
-            on_close=lambda _ws, _, __: self.reset(),
-            on_error=lambda _ws, _: self.reset(),
+            on_message=self.on_message,
+            on_close=self._onClose,
+            on_error=self._onError,
         )
+        self.thread: threading.Thread | None = None
+        # decodes and answers the RSCP commands, a single thread keeps the message order
+        self._worker = self._newExecutor("E3DC_RSCP_web")
+        # all frames go out through a single sender thread, in the order they were queued
+        self._sender = self._newExecutor("E3DC_RSCP_web_send")
+        # the server answers in order, so a response goes to the oldest request expecting it
+        self._pendingRequests: Deque[PendingRequest] = collections.deque()
+        self._pendingLock = threading.Lock()
+        # counts the resets, work queued for an earlier connection is dropped
+        self._generation = 0
         self.reset()
 
     def reset(self):
@@ -134,11 +251,19 @@ class E3DC_RSCP_web:
         self.virtConId = None
         self.virtAuthLevel = None
         self.webSerialno = None
-        self.responseCallback: Callable[
-            [Tuple[str | int | RscpTag, str | int | RscpType, Any]], None
-        ]
-        self.responseCallbackCalled = False
-        self.requestResult: Tuple[str | int | RscpTag, str | int | RscpType, Any]
+        self._infoSerialNumber: str | None = None
+        # encoded connection id and auth level, the fixed start of every RSCP_CMD
+        self._cmdPrefix = b""
+        self._virtCmdPrefix = b""
+        with self._pendingLock:
+            self._generation += 1
+            pendingRequests = self._pendingRequests
+            self._pendingRequests = collections.deque()
+        for request in pendingRequests:
+            # no answer will come on this connection, wake the waiting thread now
+            request.event.set()
+        # signalled by the websocket thread, waited on by the caller
+        self._connectedEvent = threading.Event()
 
     def buildVirtualConn(self):
         """Method to create Virtual Connection."""
@@ -161,120 +286,182 @@ class E3DC_RSCP_web:
         )
 
         # print("--------------------- Sending virtual conn")
-        self.ws.send(virtualConn, ABNF.OPCODE_BINARY)
+        self._send(virtualConn)
+
+    def _respondToINFOTime(
+        self, _decoded: Tuple[str | int | RscpTag, str | int | RscpType, Any]
+    ) -> bytes:
+        return rscpEncode(
+            RscpTag.INFO_TIME, RscpType.ByteArray, timestampEncode(time.time())
+        )
+
+    def _respondToINFOTimeZone(
+        self, _decoded: Tuple[str | int | RscpTag, str | int | RscpType, Any]
+    ) -> bytes:
+        TIMEZONE_STR, _ = calcTimeZone()
+        return _encodeTimeZone(TIMEZONE_STR)
+
+    def _respondToINFOUtcTime(
+        self, _decoded: Tuple[str | int | RscpTag, str | int | RscpType, Any]
+    ) -> bytes:
+        _, utcDiffS = calcTimeZone()
+        return rscpEncode(
+            RscpTag.INFO_UTC_TIME,
+            RscpType.ByteArray,
+            timestampEncode(time.time() - utcDiffS),
+        )
+
+    def _respondToINFOInfo(
+        self, _decoded: Tuple[str | int | RscpTag, str | int | RscpType, Any]
+    ) -> bytes:
+        return rscpEncode(
+            RscpTag.INFO_INFO,
+            RscpType.Container,
+            [
+                (
+                    RscpTag.INFO_SERIAL_NUMBER,
+                    RscpType.CString,
+                    self._infoSerialNumber,
+                ),
+                (
+                    RscpTag.INFO_PRODUCTION_DATE,
+                    RscpType.CString,
+                    "570412800000",
+                ),
+                (
+                    RscpTag.INFO_MAC_ADDRESS,
+                    RscpType.CString,
+                    "00:00:00:00:00:00",
+                ),
+            ],
+        )
+
+    def _respondToINFOSerialNumber(
+        self, decoded: Tuple[str | int | RscpTag, str | int | RscpType, Any]
+    ) -> bytes:
+        self.webSerialno = decoded[2]
+        self.buildVirtualConn()
+        return b""  # nothing to answer
+
+    # dispatch table for the INFO requests whose answer depends on the current state
+    _INFO_HANDLERS: Dict[
+        RscpTag,
+        Callable[
+            [E3DC_RSCP_web, Tuple[str | int | RscpTag, str | int | RscpType, Any]],
+            bytes,
+        ],
+    ] = {
+        RscpTag.INFO_REQ_TIME: _respondToINFOTime,
+        RscpTag.INFO_REQ_TIME_ZONE: _respondToINFOTimeZone,
+        RscpTag.INFO_REQ_UTC_TIME: _respondToINFOUtcTime,
+        RscpTag.INFO_REQ_INFO: _respondToINFOInfo,
+        RscpTag.INFO_SERIAL_NUMBER: _respondToINFOSerialNumber,
+    }
 
     def respondToINFORequest(
         self, decoded: Tuple[str | int | RscpTag, str | int | RscpType, Any]
     ):
         """Create Response to INFO request."""
-        TIMEZONE_STR, utcDiffS = calcTimeZone()
-
-        try:
-            tag = getRscpTag(decoded[0])
-        except KeyError:
+        tag = getRscpTagOrNone(decoded[0])
+        if tag is None:
             # This is a tag unknown to this library
             return None
 
-        if tag == RscpTag.INFO_REQ_IP_ADDRESS:
-            return rscpEncode(RscpTag.INFO_IP_ADDRESS, RscpType.CString, "0.0.0.0")
-        elif tag == RscpTag.INFO_REQ_SUBNET_MASK:
-            return rscpEncode(RscpTag.INFO_SUBNET_MASK, RscpType.CString, "0.0.0.0")
-        elif tag == RscpTag.INFO_REQ_GATEWAY:
-            return rscpEncode(RscpTag.INFO_GATEWAY, RscpType.CString, "0.0.0.0")
-        elif tag == RscpTag.INFO_REQ_DNS:
-            return rscpEncode(RscpTag.INFO_DNS, RscpType.CString, "0.0.0.0")
-        elif tag == RscpTag.INFO_REQ_DHCP_STATUS:
-            return rscpEncode(RscpTag.INFO_DHCP_STATUS, RscpType.Bool, "false")
-        elif tag == RscpTag.INFO_REQ_TIME:
-            return rscpEncode(
-                RscpTag.INFO_TIME, RscpType.ByteArray, timestampEncode(time.time())
-            )
-        elif tag == RscpTag.INFO_REQ_TIME_ZONE:
-            return rscpEncode(RscpTag.INFO_TIME_ZONE, RscpType.CString, TIMEZONE_STR)
-        elif tag == RscpTag.INFO_REQ_UTC_TIME:
-            return rscpEncode(
-                RscpTag.INFO_UTC_TIME,
-                RscpType.ByteArray,
-                timestampEncode(time.time() - utcDiffS),
-            )
-        elif tag == RscpTag.INFO_REQ_A35_SERIAL_NUMBER:
-            return rscpEncode(
-                RscpTag.INFO_A35_SERIAL_NUMBER, RscpType.CString, "123456"
-            )
-        elif tag == RscpTag.INFO_REQ_INFO:
-            return rscpEncode(
-                RscpTag.INFO_INFO,
-                RscpType.Container,
-                [
-                    (
-                        RscpTag.INFO_SERIAL_NUMBER,
-                        RscpType.CString,
-                        "WEB_"
-                        + hashlib.md5(self.username + bytes(self.conId)).hexdigest(),
-                    ),
-                    (
-                        RscpTag.INFO_PRODUCTION_DATE,
-                        RscpType.CString,
-                        "570412800000",
-                    ),
-                    (
-                        RscpTag.INFO_MAC_ADDRESS,
-                        RscpType.CString,
-                        "00:00:00:00:00:00",
-                    ),
-                ],
-            )
-        elif tag == RscpTag.INFO_SERIAL_NUMBER:
-            self.webSerialno = decoded[2]
-            self.buildVirtualConn()
-            return ""
-        return None  # this is no standard request
+        staticResponse = self._STATIC_INFO_RESPONSES.get(tag)
+        if staticResponse is not None:
+            return staticResponse
+
+        handler = self._INFO_HANDLERS.get(tag)
+        if handler is None:
+            return None  # this is no standard request
+        return handler(self, decoded)
 
     def registerConnectionHandler(
         self, decodedMsg: Tuple[str | int | RscpTag, str | int | RscpType, Any]
     ):
         """Registering Connection Handler."""
-        if self.conId == 0:
-            self.conId = rscpFindTagIndex(decodedMsg, RscpTag.SERVER_CONNECTION_ID)
-            self.authLevel = rscpFindTagIndex(decodedMsg, RscpTag.SERVER_AUTH_LEVEL)
+        conIdMsg, authLevelMsg = rscpFindTags(
+            decodedMsg, [RscpTag.SERVER_CONNECTION_ID, RscpTag.SERVER_AUTH_LEVEL]
+        )
+        conId: Any = conIdMsg[2] if conIdMsg is not None else None
+        authLevel: Any = authLevelMsg[2] if authLevelMsg is not None else None
+        isVirtual = self.conId != 0
+        if not isVirtual:
+            self.conId = conId
+            self.authLevel = authLevel
+            # depends only on the username and the connection id, so compute it once.
+            # It only has to look like a serial number, any fast hash will do.
+            # bytes(conId) would be conId zero bytes, hash the Int64 value instead
+            conIdBytes = int(conId).to_bytes(8, "little", signed=True)
+            serialDigest = hashlib.blake2s(self.username + conIdBytes, digest_size=16)
+            self._infoSerialNumber = "WEB_" + serialDigest.hexdigest()
+            self._cmdPrefix = self._encodeCmdPrefix(conId, authLevel)
         else:
-            self.virtConId = rscpFindTagIndex(decodedMsg, RscpTag.SERVER_CONNECTION_ID)
-            self.virtAuthLevel = rscpFindTagIndex(decodedMsg, RscpTag.SERVER_AUTH_LEVEL)
+            self.virtConId = conId
+            self.virtAuthLevel = authLevel
+            self._virtCmdPrefix = self._encodeCmdPrefix(conId, authLevel)
         # reply = rscpFrame(rscpEncode(RscpTag.SERVER_CONNECTION_REGISTERED, RscpType.Container, [decodedMsg[2][0], decodedMsg[2][1]]));
         reply = rscpFrame(
             rscpEncode(
                 RscpTag.SERVER_CONNECTION_REGISTERED,
                 RscpType.Container,
-                [
-                    rscpFindTag(decodedMsg, RscpTag.SERVER_CONNECTION_ID),
-                    rscpFindTag(decodedMsg, RscpTag.SERVER_AUTH_LEVEL),
-                ],
+                [conIdMsg, authLevelMsg],
+            )
+        )
+        self._send(reply)
+        if isVirtual:
+            # only now, so the first request is queued behind the reply
+            self._connectedEvent.set()
+
+    @staticmethod
+    def _encodeCmdPrefix(conId: Any, authLevel: Any) -> bytes:
+        """Encodes the connection id and auth level once per connection."""
+        conIdData = rscpEncode(RscpTag.SERVER_CONNECTION_ID, RscpType.Int64, conId)
+        authLevelData = rscpEncode(
+            RscpTag.SERVER_AUTH_LEVEL, RscpType.UChar8, authLevel
+        )
+        return conIdData + authLevelData
+
+    @staticmethod
+    def _encodeCmd(cmdPrefix: bytes, innerFrame: bytes) -> bytes:
+        """Wraps an inner frame into a SERVER_REQ_RSCP_CMD frame.
+
+        The inner data has to be a complete RSCP frame itself, the server frames
+        its SERVER_RSCP_DATA the same way, so the second rscpFrame is not redundant.
+        """
+        lenData = rscpEncode(
+            RscpTag.SERVER_RSCP_DATA_LEN, RscpType.Int32, len(innerFrame)
+        )
+        frameData = rscpEncode(RscpTag.SERVER_RSCP_DATA, RscpType.ByteArray, innerFrame)
+        return rscpFrame(
+            rscpEncode(
+                RscpTag.SERVER_REQ_RSCP_CMD,
+                RscpType.Container,
+                cmdPrefix + lenData + frameData,
             )
         )
-        self.ws.send(reply, ABNF.OPCODE_BINARY)
 
-    def on_message(self, message: bytes):
-        """Method to handle a received message."""
+    def on_message(self, _ws: WebSocketApp, message: bytes):
+        """Method to handle a received message.
+
+        Registered directly as the on_message callback of the WebSocketApp.
+        """
         # print "Received message", message
         if len(message) == 0:
             return
 
         decodedMsg = rscpDecode(message)[0]
-        try:
-            tag = getRscpTag(decodedMsg[0])
-        except KeyError:
+        tag = getRscpTagOrNone(decodedMsg[0])
+        if tag is None:
             # This is a tag unknown to this library
-            raise
+            return
 
         # print "Decoded received message", decodedMsg
         if tag == RscpTag.SERVER_REQ_PING:
             pingFrame = rscpFrame(
                 rscpEncode(RscpTag.SERVER_PING, RscpType.NoneType, None)
             )
-            self.ws.send(
-                pingFrame,
-                ABNF.OPCODE_BINARY,
-            )
+            self._send(pingFrame)
             return
         elif tag == RscpTag.SERVER_REGISTER_CONNECTION:
             self.registerConnectionHandler(decodedMsg)
@@ -282,74 +469,193 @@ class E3DC_RSCP_web:
             # this signifies some error
             self.disconnect()
         elif tag == RscpTag.SERVER_REQ_RSCP_CMD:
-            data = rscpFrameDecode(
-                rscpFindTagIndex(decodedMsg, RscpTag.SERVER_RSCP_DATA)
-            )[0]
-            response = b""
-            self.responseCallbackCalled = False
-            while len(data) > 0:
-                (
-                    decoded,
-                    size,  # pyright: ignore [reportUnusedVariable]
-                ) = rscpDecode(data)
-                # print "Inner frame chunk decoded", decoded
-                data = data[size:]
-                responseChunk = self.respondToINFORequest(decoded)
-                if responseChunk is None:
-                    # this is not a standard request: call the registered callback
-
-                    self.responseCallback(
-                        decoded
-                    )  # !!! Important!!! This is where the callback is called with the decoded inner frame
-                    self.responseCallbackCalled = True
-                    responseChunk = b""
-
-                if isinstance(responseChunk, str):
-                    responseChunk = responseChunk.encode("utf-8")
-                response += responseChunk
-            if len(response) == 0:
-                return  # do not send an empty response
-            innerFrame = rscpFrame(response)
-            responseContainer = rscpEncode(
-                RscpTag.SERVER_REQ_RSCP_CMD,
-                RscpType.Container,
-                [
-                    (RscpTag.SERVER_CONNECTION_ID, RscpType.Int64, self.conId),
-                    (RscpTag.SERVER_AUTH_LEVEL, RscpType.UChar8, self.authLevel),
-                    (RscpTag.SERVER_RSCP_DATA_LEN, RscpType.Int32, len(innerFrame)),
-                    (RscpTag.SERVER_RSCP_DATA, RscpType.ByteArray, innerFrame),
-                ],
+            # decoding, answering and the callbacks run on the worker thread, so this
+            # thread can go on receiving. A single worker keeps the message order,
+            # which is needed to match the responses to the pending requests.
+            generation = self._generation
+            future = self._worker.submit(self._handleRscpCmd, decodedMsg, generation)
+            future.add_done_callback(
+                functools.partial(self._checkWorkerResult, generation=generation)
             )
 
-            self.ws.send(
-                rscpFrame(responseContainer),
-                ABNF.OPCODE_BINARY,
-            )
+    def _onClose(self, _ws: WebSocketApp, _statusCode: Any, _reason: Any):
+        self.reset()
+
+    def _onError(self, _ws: WebSocketApp, _error: Exception):
+        self.reset()
 
-    def _defaultRequestCallback(
-        self, msg: Tuple[str | int | RscpTag, str | int | RscpType, Any]
+    def _checkWorkerResult(
+        self, future: concurrent.futures.Future[Any], generation: int
     ):
-        self.requestResult = msg
+        if generation != self._generation:
+            return  # the failed work belongs to a connection which was reset since
+        if future.exception() is not None:
+            # like websocket-client does for errors raised in on_message or send
+            self.reset()
+
+    def _handleRscpCmd(
+        self,
+        decodedMsg: Tuple[str | int | RscpTag, str | int | RscpType, Any],
+        generation: int,
+    ):
+        if generation != self._generation:
+            return  # received before a reset, it belongs to the previous connection
+        dataFrame = rscpFindTagIndex(decodedMsg, RscpTag.SERVER_RSCP_DATA)
+        data = rscpFrameDecode(dataFrame)[0]
+        responseChunks: List[bytes] = []
+        # walk the inner frame with an offset, slicing the bytes would copy the
+        # remaining data for every chunk
+        offset = 0
+        while offset < len(data):
+            decoded, size = rscpDecode(data, offset)
+            # print "Inner frame chunk decoded", decoded
+            offset += size
+            responseChunk = self.respondToINFORequest(decoded)
+            if responseChunk is None:
+                # this is not a standard request: it answers a pending request
+                self._completeRequest(
+                    decoded, generation
+                )  # !!! Important!!! This is where the callback is called with the decoded inner frame
+                continue
+
+            if len(responseChunk) > 0:
+                responseChunks.append(responseChunk)
+        if len(responseChunks) == 0:
+            return  # do not send an empty response
+        innerFrame = rscpFrame(b"".join(responseChunks))
+        self._send(self._encodeCmd(self._cmdPrefix, innerFrame))
+
+    def _completeRequest(
+        self,
+        msg: Tuple[str | int | RscpTag, str | int | RscpType, Any],
+        generation: int,
+    ):
+        responseTag = _responseTagValue(msg[0])
+        with self._pendingLock:
+            if generation != self._generation:
+                return  # the connection was reset, its requests are gone
+            request = self._takePendingRequest(responseTag)
+        if request is not None:
+            request.complete(msg)
+
+    def _takePendingRequest(self, responseTag: int | None) -> PendingRequest | None:
+        """Remove the request answered by a response from the queue.
+
+        The server answers in order, so this is the oldest request expecting the tag.
+        Timed out requests are skipped: their answer may never come, and if they
+        kept the head of the queue, every later response would go to the request
+        before it. Needs the pending lock.
+        """
+        pending = self._pendingRequests
+        for index, request in enumerate(pending):
+            if request.abandoned or not request.expects(responseTag):
+                continue
+            # the timed out requests sent before this one will not be answered anymore
+            skipped = [r for r in itertools.islice(pending, index) if not r.abandoned]
+            for _ in range(index + 1):
+                pending.popleft()
+            pending.extendleft(reversed(skipped))
+            return request
+        for request in pending:
+            if request.abandoned and request.expects(responseTag):
+                # the late response of a request which timed out, throw it away
+                pending.remove(request)
+                break
+        return None  # nobody is waiting for this message
+
+    def submitRequest(
+        self, message: Tuple[str | int | RscpTag, str | int | RscpType, Any]
+    ) -> PendingRequest:
+        """Send a request without waiting for the response.
+
+        Several requests can be submitted before waiting for them, their responses
+        are then received while the other requests are still on their way.
+
+        Args:
+            message (tuple): the request to send
+
+        Returns:
+            PendingRequest: the request to pass to waitForResponse
+        """
+        return self._sendRequest_internal(message)
+
+    def waitForResponse(
+        self, request: PendingRequest
+    ) -> Tuple[str | int | RscpTag, str | int | RscpType, Any]:
+        """Wait for the response to a submitted request.
+
+        Args:
+            request (PendingRequest): the request returned by submitRequest
+
+        Returns:
+            tuple: the response message
+        """
+        if not request.event.wait(self.TIMEOUT):
+            # the request stays queued: the server may still answer it, and its late
+            # response must not complete the next request
+            with self._pendingLock:
+                request.abandoned = True
+            raise RequestTimeoutError
+        if request.result is None:
+            raise RequestTimeoutError  # the connection was reset
+
+        return request.result
 
     def sendRequest(
         self, message: Tuple[str | int | RscpTag, str | int | RscpType, Any]
     ) -> Tuple[str | int | RscpTag, str | int | RscpType, Any]:
         """Send a request and wait for a response."""
-        self._sendRequest_internal(rscpFrame(rscpEncode(message)))
-        for _ in range(self.TIMEOUT * 10):
-            if self.responseCallbackCalled:
-                break
-            time.sleep(0.1)
-        if not self.responseCallbackCalled:
-            raise RequestTimeoutError
+        return self.waitForResponse(self.submitRequest(message))
 
-        return self.requestResult
+    async def sendRequestAsync(
+        self, message: Tuple[str | int | RscpTag, str | int | RscpType, Any]
+    ) -> Tuple[str | int | RscpTag, str | int | RscpType, Any]:
+        """Send a request and wait for a response without blocking the event loop.
+
+        Several requests can be awaited concurrently, they are answered in order.
+        """
+        request = self.submitRequest(message)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.waitForResponse, request)
+
+    def submitRequests(
+        self, messages: List[Tuple[str | int | RscpTag, str | int | RscpType, Any]]
+    ) -> List[PendingRequest]:
+        """Send several requests in a single frame without waiting for the responses.
+
+        Args:
+            messages (list): the requests to send
+
+        Returns:
+            list: the PendingRequest for each message, in the same order
+        """
+        if not self.isConnected():
+            raise SocketNotReady
+
+        requests = [PendingRequest(tag=m[0]) for m in messages]
+        if len(requests) > 0:
+            innerFrame = rscpFrame(b"".join(rscpEncode(m) for m in messages))
+            self._sendInnerFrame(innerFrame, requests)
+        return requests
+
+    def sendRequests(
+        self, messages: List[Tuple[str | int | RscpTag, str | int | RscpType, Any]]
+    ) -> List[Tuple[str | int | RscpTag, str | int | RscpType, Any]]:
+        """Send several requests in a single frame and wait for all responses.
+
+        Args:
+            messages (list): the requests to send
+
+        Returns:
+            list: the response to each message, in the same order
+        """
+        return [self.waitForResponse(r) for r in self.submitRequests(messages)]
 
     def sendCommand(
         self, message: Tuple[str | int | RscpTag, str | int | RscpType, Any]
     ):
         """Send a command."""
-        return self._sendRequest_internal(rscpFrame(rscpEncode(message)))
+        return self._sendRequest_internal(message)
 
     def _sendRequest_internal(
         self,
@@ -358,67 +664,87 @@ class E3DC_RSCP_web:
             Callable[[Tuple[str | int | RscpTag, str | int | RscpType, Any]], None]
             | None
         ) = None,
-    ):
+    ) -> PendingRequest:
         """Internal send request method.
 
         Args:
             innerFrame (Union[tuple, <RSCP encoded frame>]): inner frame
-            callback (str): callback method
-            synchronous (bool): If True, the method waits for a response (i.e. exits after calling callback).
-                If True and callback = None, the method returns the (last) response message
+            callback (str): callback method, called with the response
+
+        Returns:
+            PendingRequest: the request waiting for its response
         """
         if not self.isConnected():
             raise SocketNotReady
 
+        tag = None
         if isinstance(innerFrame, tuple):
             # if innerframe is a tuple then the message is not encoded
+            tag = innerFrame[0]
             innerFrame = rscpFrame(rscpEncode(*innerFrame))
 
-        # self.requestResult = None
-        self.responseCallbackCalled = False
-        if callback is None:
-            self.responseCallback = lambda msg: self._defaultRequestCallback(msg)  # type: ignore
-        else:
-            self.responseCallback = callback
+        request = PendingRequest(callback, tag)
+        self._sendInnerFrame(innerFrame, [request])
+        return request
 
-        outerFrame = rscpFrame(
-            rscpEncode(
-                RscpTag.SERVER_REQ_RSCP_CMD,
-                RscpType.Container,
-                [
-                    (RscpTag.SERVER_CONNECTION_ID, RscpType.Int64, self.virtConId),
-                    (
-                        RscpTag.SERVER_AUTH_LEVEL,
-                        RscpType.UChar8,
-                        self.virtAuthLevel,
-                    ),
-                    (RscpTag.SERVER_RSCP_DATA_LEN, RscpType.Int32, len(innerFrame)),
-                    (RscpTag.SERVER_RSCP_DATA, RscpType.ByteArray, innerFrame),
-                ],
-            )
+    def _sendInnerFrame(self, innerFrame: bytes, requests: List[PendingRequest]):
+        outerFrame = self._encodeCmd(self._virtCmdPrefix, innerFrame)
+
+        with self._pendingLock:
+            self._pendingRequests.extend(requests)
+        self._send(outerFrame)
+
+    def _send(self, frame: bytes):
+        # neither the websocket thread nor the callers wait for the socket write
+        generation = self._generation
+        future = self._sender.submit(self._sendFrame, frame, generation)
+        future.add_done_callback(
+            functools.partial(self._checkWorkerResult, generation=generation)
         )
 
-        self.ws.send(outerFrame, ABNF.OPCODE_BINARY)
+    def _sendFrame(self, frame: bytes, generation: int):
+        if generation != self._generation:
+            return  # queued before a reset, it must not go out on the next connection
+        self.ws.send(frame, ABNF.OPCODE_BINARY)
 
     def connect(self):
         """Connect to E3DC system."""
         self.reset()
+        if self.thread is not None and self.thread.is_alive():
+            # the WebSocketApp is reused, let the previous run_forever finish first
+            self.thread.join(self.TIMEOUT)
+        # fresh threads, so the work still queued for the previous connection
+        # does not hold up this one
+        self._replaceExecutors()
         self.thread = threading.Thread(
-            target=self.ws.run_forever  # pyright: ignore [reportUnknownMemberType, reportUnknownArgumentType]
+            target=self.ws.run_forever,  # pyright: ignore [reportUnknownMemberType, reportUnknownArgumentType]
+            # websocket-client sets these by default too, do not depend on it
+            kwargs={"sockopt": self._SOCKET_OPTIONS},
         )
 
         self.thread.start()
 
-        for _ in range(self.TIMEOUT * 10):
-            if self.isConnected():
-                break
-            time.sleep(0.1)
-        if not self.isConnected():
+        if not self._connectedEvent.wait(self.TIMEOUT):
             raise RequestTimeoutError
 
     def disconnect(self):
         """Disconnect from E3DC system."""
         self.reset()
+        self._replaceExecutors()
+
+    def _replaceExecutors(self):
+        # the threads of the old executors end once their queued work is done, the
+        # new ones only start a thread on first use
+        self._worker.shutdown(wait=False)
+        self._sender.shutdown(wait=False)
+        self._worker = self._newExecutor("E3DC_RSCP_web")
+        self._sender = self._newExecutor("E3DC_RSCP_web_send")
+
+    @staticmethod
+    def _newExecutor(threadNamePrefix: str) -> concurrent.futures.ThreadPoolExecutor:
+        return concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=threadNamePrefix
+        )
 
     def isConnected(self):
         """Validate connection status.
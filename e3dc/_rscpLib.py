@@ -6,17 +6,18 @@
 
 from __future__ import annotations  # required for python < 3.9
 
-import math
+import functools
 import struct
 import time
 import zlib
-from typing import Any, List, Tuple
+from typing import Any, Callable, Dict, List, Tuple, cast
 
 from ._rscpTags import (
     RscpTag,
     RscpType,
     getHexRscpTag,
     getHexRscpType,
+    getRscpTagOrNone,
     getRscpType,
     getStrRscpError,
     getStrRscpTag,
@@ -60,6 +61,34 @@ packFmtDict_VarSize = {
     RscpType.Error: "s",
 }
 
+# the formats are compiled once, struct.pack would parse the format string on every call
+_HEADER_STRUCT = struct.Struct(
+    "<IBH"  # format of header: little-endian, Uint32 tag, Uint8 type, Uint16 length
+)
+_FRAME_HEADER_STRUCT = struct.Struct("<HHIIIH")
+_CRC_STRUCT = struct.Struct("<I")
+_MAGIC_STRUCT = struct.Struct(">H")
+_TIMESTAMP_STRUCT = struct.Struct("<iii")
+# magic and ctrl are big-endian in the otherwise little-endian frame header,
+# these are their values as read with the little-endian header format
+_FRAME_MAGIC = 0xDCE3  # 0xE3DC
+_FRAME_CTRL = 0x1100  # 0x11: protocol version 1, crc enabled
+_FRAME_CTRL_CRC = 0x1000  # 0x10: crc enabled
+_FIXED_SIZE_STRUCTS = {
+    rscptype: struct.Struct("<IBH" + fmt)
+    for rscptype, fmt in packFmtDict_FixedSize.items()
+}
+# keyed by the type value read from the header, hashing an Enum member is slow
+_FIXED_SIZE_VALUE_STRUCTS = {
+    rscptype.value: struct.Struct("<" + fmt)
+    for rscptype, fmt in packFmtDict_FixedSize.items()
+}
+# decoding looks up every header's tag and type, plain dicts are the fastest way
+_TAG_NAMES_BY_VALUE = {rscptag.value: rscptag.name for rscptag in RscpTag}
+_TYPES_BY_VALUE = {
+    rscptype.value: (rscptype, getStrRscpType(rscptype)) for rscptype in RscpType
+}
+
 
 def rscpFindTag(
     decodedMsg: Tuple[str | int | RscpTag, str | int | RscpType, Any] | None,
@@ -74,27 +103,70 @@ def rscpFindTag(
     Returns:
         list: the found tag
     """
-    try:
-        tagStr = getStrRscpTag(tag)
-    except KeyError:
+    rscpTag = getRscpTagOrNone(tag)
+    if rscpTag is None:
         # Tag is unknown to this library
         return None
+    tagStr = rscpTag.name
 
     if decodedMsg is None:
         return None
-    if decodedMsg[0] == tagStr:
-        return decodedMsg
-    if isinstance(decodedMsg[2], list):
-        msgList: List[Tuple[str | int | RscpTag, str | int | RscpType, Any]] = (
-            decodedMsg[2]
-        )
-        for msg in msgList:
-            msgValue = rscpFindTag(msg, tag)
-            if msgValue is not None:
-                return msgValue
+
+    # depth-first search with an explicit stack, children are pushed in reverse
+    # order to visit them in the same order as a recursive descent would
+    stack: List[Tuple[str | int | RscpTag, str | int | RscpType, Any]] = [decodedMsg]
+    while stack:
+        msg = stack.pop()
+        if msg[0] == tagStr:
+            return msg
+        if isinstance(msg[2], list):
+            msgList: List[Tuple[str | int | RscpTag, str | int | RscpType, Any]]
+            msgList = msg[2]
+            stack.extend(reversed(msgList))
     return None
 
 
+def rscpFindTags(
+    decodedMsg: Tuple[str | int | RscpTag, str | int | RscpType, Any] | None,
+    tags: List[int | str | RscpTag],
+) -> List[Tuple[str | int | RscpTag, str | int | RscpType, Any] | None]:
+    """Finds the submessages for several tags in a single pass.
+
+    Args:
+    decodedMsg (tuple): the decoded message
+    tags (list): the RSCP Tags to search for
+
+    Returns:
+        list: the found tag for each of the tags, None if it was not found
+    """
+    found: List[Tuple[str | int | RscpTag, str | int | RscpType, Any] | None] = [
+        None
+    ] * len(tags)
+    # position of every known tag name which still has to be found
+    missing: Dict[str, List[int]] = {}
+    for i, tag in enumerate(tags):
+        rscpTag = getRscpTagOrNone(tag)
+        if rscpTag is not None:  # otherwise the tag is unknown to this library
+            missing.setdefault(rscpTag.name, []).append(i)
+
+    if decodedMsg is None:
+        return found
+
+    # same depth-first order as rscpFindTag, stops once everything was found
+    stack: List[Tuple[str | int | RscpTag, str | int | RscpType, Any]] = [decodedMsg]
+    while stack and missing:
+        msg = stack.pop()
+        if isinstance(msg[0], str) and msg[0] in missing:
+            for i in missing.pop(msg[0]):
+                found[i] = msg
+        if isinstance(msg[2], list):
+            msgList = cast(
+                "List[Tuple[str | int | RscpTag, str | int | RscpType, Any]]", msg[2]
+            )
+            stack.extend(reversed(msgList))
+    return found
+
+
 def rscpFindTagIndex(
     decodedMsg: Tuple[str | int | RscpTag, str | int | RscpType, Any] | None,
     tag: int | str | RscpTag,
@@ -117,9 +189,73 @@ def rscpFindTagIndex(
         return None
 
 
-def endianSwapUint16(val: int):
-    """Endian swaps magic and ctrl."""
-    return struct.unpack("<H", struct.pack(">H", val))[0]
+def rscpTagMap(
+    decodedMsg: Tuple[str | int | RscpTag, str | int | RscpType, Any] | None,
+) -> Dict[str, Tuple[str | int | RscpTag, str | int | RscpType, Any]]:
+    """Maps the tag names of a decoded message to their submessages.
+
+    Walking the message once allows many fields to be read from the same response
+    without searching the whole message for each of them.
+
+    Args:
+    decodedMsg (tuple): the decoded message
+
+    Returns:
+        dict: the first submessage for each tag name, in the order rscpFindTag
+        would find them
+    """
+    tagMap: Dict[str, Tuple[str | int | RscpTag, str | int | RscpType, Any]] = {}
+    if decodedMsg is None:
+        return tagMap
+
+    stack: List[Tuple[str | int | RscpTag, str | int | RscpType, Any]] = [decodedMsg]
+    while stack:
+        msg = stack.pop()
+        if isinstance(msg[0], str):
+            tagMap.setdefault(msg[0], msg)
+        if isinstance(msg[2], list):
+            msgList = cast(
+                "List[Tuple[str | int | RscpTag, str | int | RscpType, Any]]", msg[2]
+            )
+            stack.extend(reversed(msgList))
+    return tagMap
+
+
+def rscpFindTagIndexInMap(
+    tagMap: Dict[str, Tuple[str | int | RscpTag, str | int | RscpType, Any]],
+    tag: int | str | RscpTag,
+    index: int = 2,
+) -> Any:
+    """Finds a submessage with a specific tag in a tag map and extracts an index.
+
+    Args:
+    tagMap (dict): the tag map built by rscpTagMap
+    tag (RscpTag): the RSCP Tag to search for
+    index (int): the index of the found tag to return. Default is 2, the value of the Tag.
+
+    Returns:
+        the content of the configured index for the tag.
+    """
+    rscpTag = getRscpTagOrNone(tag)
+    if rscpTag is None:
+        # Tag is unknown to this library
+        return None
+    res = tagMap.get(rscpTag.name)
+    if res is not None:
+        return res[index]
+    else:
+        return None
+
+
+@functools.lru_cache(maxsize=512)
+def _resolveTagAndType(
+    tag: int | str | RscpTag, rscptype: int | str | RscpType
+) -> Tuple[int, int, RscpType]:
+    """Resolves tag and type to their hex values and the RscpType.
+
+    The same tag and type pairs are encoded over and over, so the result is cached.
+    """
+    return getHexRscpTag(tag), getHexRscpType(rscptype), getRscpType(rscptype)
 
 
 class FrameError(Exception):
@@ -128,12 +264,90 @@ class FrameError(Exception):
     pass
 
 
+def _encodeNone(tagHex: int, rscptypeHex: int, data: Any) -> bytes:
+    # special case: no content
+    return _HEADER_STRUCT.pack(tagHex, rscptypeHex, 0)
+
+
+def _encodeTimestamp(tagHex: int, rscptypeHex: int, data: Any) -> bytes:
+    # timestamp has a special format, divided into 32 bit integers
+    # integer math, a float loses precision on int64 ms and can't be packed anyway
+    ts, ms = divmod(int(data), 1000)  # ts is int64
+    ms *= 1_000_000  # ms are multiplied by 10^6
+
+    hiword = ts >> 32
+    loword = ts & 0xFFFFFFFF
+
+    return _HEADER_STRUCT.pack(
+        tagHex, rscptypeHex, _TIMESTAMP_STRUCT.size
+    ) + _TIMESTAMP_STRUCT.pack(hiword, loword, ms)
+
+
+def _encodeContainer(tagHex: int, rscptypeHex: int, data: Any) -> bytes:
+    if isinstance(data, list):
+        dataList: List[Tuple[str | int | RscpTag, str | int | RscpType, Any]] = data
+        # transform each dataChunk into byte array and join them once
+        data = b"".join(
+            rscpEncode(dataChunk[0], dataChunk[1], dataChunk[2])
+            for dataChunk in dataList
+        )
+    # otherwise the content is already encoded
+    return _HEADER_STRUCT.pack(tagHex, rscptypeHex, len(data)) + data
+
+
+def _encodeVarSize(tagHex: int, rscptypeHex: int, data: Any) -> bytes:
+    return _HEADER_STRUCT.pack(tagHex, rscptypeHex, len(data)) + data
+
+
+def _makeFixedSizeEncoder(
+    fixedStruct: struct.Struct,
+) -> Callable[[int, int, Any], bytes]:
+    pack = fixedStruct.pack
+    length = fixedStruct.size - _HEADER_STRUCT.size
+
+    def encodeFixedSize(tagHex: int, rscptypeHex: int, data: Any) -> bytes:
+        return pack(tagHex, rscptypeHex, length, data)
+
+    return encodeFixedSize
+
+
+# one encoder per type value, so rscpEncode needs a single lookup instead of a
+# chain of type comparisons
+_ENCODERS: Dict[int, Callable[[int, int, Any], bytes]] = {
+    RscpType.NoneType.value: _encodeNone,
+    RscpType.Timestamp.value: _encodeTimestamp,
+    RscpType.Container.value: _encodeContainer,
+}
+_ENCODERS.update(
+    (rscptype.value, _makeFixedSizeEncoder(fixedStruct))
+    for rscptype, fixedStruct in _FIXED_SIZE_STRUCTS.items()
+)
+_ENCODERS.update(
+    (rscptype.value, _encodeVarSize)
+    for rscptype in packFmtDict_VarSize
+    if rscptype != RscpType.Container
+)
+
+
 def rscpEncode(
     tag: int | str | RscpTag | Tuple[str | int | RscpTag, str | int | RscpType, Any],
     rscptype: int | str | RscpType | None = None,
     data: Any = None,
 ) -> bytes:
-    """RSCP encodes data."""
+    """RSCP encodes data.
+
+    Args:
+        tag (int | str | RscpTag | tuple): the RSCP Tag, or a (tag, type, data) tuple
+        rscptype (int | str | RscpType | None): the RSCP Type, None if tag is a tuple
+        data (Any): the value. The data of a Container can also be the already encoded
+            content, so a part of a request which is sent repeatedly is only encoded once.
+
+    Returns:
+        bytes: the encoded data
+
+    Tags and types are resolved through a cache, so their names, values and
+    RscpTag/RscpType members are equally cheap to pass.
+    """
     if isinstance(tag, tuple):
         rscptype = tag[1]
         data = tag[2]
@@ -141,9 +355,7 @@ def rscpEncode(
     elif rscptype is None:
         raise TypeError("Second argument must not be none if first is not a tuple")
 
-    tagHex = getHexRscpTag(tag)
-    rscptypeHex = getHexRscpType(rscptype)
-    rscptype = getRscpType(rscptype)
+    tagHex, rscptypeHex, rscptype = _resolveTagAndType(tag, rscptype)
 
     if DEBUG_DICT["print_rscp"]:
         print(">", tag, rscptype, data)
@@ -151,91 +363,72 @@ def rscpEncode(
     if isinstance(data, str):
         data = data.encode("utf-8")
 
-    packFmt = (
-        "<IBH"  # format of header: little-endian, Uint32 tag, Uint8 type, Uint16 length
-    )
-    headerLen = struct.calcsize(packFmt)
-
-    if rscptype == RscpType.NoneType:  # special case: no content
-        return struct.pack(packFmt, tagHex, rscptypeHex, 0)
-    elif (
-        rscptype == RscpType.Timestamp
-    ):  # timestamp has a special format, divided into 32 bit integers
-        ts = int(data / 1000)  # this is int64
-        ms = (data - ts * 1000) * 1e6  # ms are multiplied by 10^6
-
-        hiword = ts >> 32
-        loword = ts & 0xFFFFFFFF
-
-        packFmt += "iii"
-        length = struct.calcsize(packFmt) - headerLen
-
-        return struct.pack(packFmt, tagHex, rscptypeHex, length, hiword, loword, ms)
-    elif rscptype == RscpType.Container:
-        if isinstance(data, list):
-            newData = b""
-            dataList: List[Tuple[str | int | RscpTag, str | int | RscpType, Any]] = data
-            for dataChunk in dataList:
-                newData += rscpEncode(
-                    dataChunk[0], dataChunk[1], dataChunk[2]
-                )  # transform each dataChunk into byte array
-            data = newData
-            packFmt += str(len(data)) + packFmtDict_VarSize[rscptype]
-    elif rscptype in packFmtDict_FixedSize:
-        packFmt += packFmtDict_FixedSize[rscptype]
-    elif rscptype in packFmtDict_VarSize:
-        packFmt += str(len(data)) + packFmtDict_VarSize[rscptype]
-
-    length = struct.calcsize(packFmt) - headerLen
-    return struct.pack(packFmt, tagHex, rscptypeHex, length, data)
+    encoder = _ENCODERS.get(rscptypeHex)
+    if encoder is None:
+        raise struct.error("data type can't be encoded")
+    return encoder(tagHex, rscptypeHex, data)
 
 
 def rscpFrame(data: bytes) -> bytes:
     """Generates RSCP frame."""
-    magic = endianSwapUint16(0xE3DC)
-    ctrl = endianSwapUint16(0x11)
-    t = time.time()
-    sec1 = math.ceil(t)
+    # integer math on the nanosecond clock, the field holds milliseconds as
+    # rscpFrameDecode expects
+    sec1, ns = divmod(time.time_ns(), 1_000_000_000)
+    ns //= 1_000_000
     sec2 = 0
-    ns = round((t - int(t)) * 1000)
-    length = len(data)
-    packFmt = "<HHIIIH" + str(length) + "s"
-    frame = struct.pack(packFmt, magic, ctrl, sec1, sec2, ns, length, data)
-    crc = zlib.crc32(frame) % (1 << 32)  # unsigned crc32
-    frame += struct.pack("<I", crc)
-    return frame
-
-
-def rscpFrameDecode(frameData: bytes, returnFrameLen: bool = False):
-    """Decodes RSCP Frame."""
-    headerFmt = "<HHIIIH"
-    crcFmt = "I"
-    crc = None
-
-    magic, ctrl, sec1, _, ns, length = struct.unpack(
-        headerFmt, frameData[: struct.calcsize(headerFmt)]
+    header = _FRAME_HEADER_STRUCT.pack(
+        _FRAME_MAGIC, _FRAME_CTRL, sec1, sec2, ns, len(data)
     )
+    # chained crc over header and data, so the frame is only assembled once
+    crc = zlib.crc32(data, zlib.crc32(header))
+    return b"".join((header, data, _CRC_STRUCT.pack(crc)))
 
-    magic = endianSwapUint16(magic)
-    ctrl = endianSwapUint16(ctrl)
 
-    if ctrl & 0x10:  # crc enabled
-        totalLen = struct.calcsize(headerFmt) + length + struct.calcsize(crcFmt)
-        data, crc = struct.unpack(
-            "<" + str(length) + "s" + crcFmt,
-            frameData[struct.calcsize(headerFmt) : totalLen],
-        )
+def rscpFrameLength(frameData: bytes) -> int:
+    """Returns the total length of an RSCP frame from its header."""
+    magic, ctrl, _, _, _, length = _FRAME_HEADER_STRUCT.unpack_from(frameData)
+
+    if magic != _FRAME_MAGIC:
+        raise FrameError("Not an RSCP frame")
+
+    totalLen = _FRAME_HEADER_STRUCT.size + length
+    if ctrl & _FRAME_CTRL_CRC:
+        totalLen += _CRC_STRUCT.size
+    return totalLen
+
+
+def rscpFrameDecode(
+    frameData: bytes | memoryview,
+    returnFrameLen: bool = False,
+    verifyCrc: bool = True,
+):
+    """Decodes RSCP Frame.
+
+    Args:
+        frameData (bytes | memoryview): the buffer starting with the frame
+        returnFrameLen (bool): also return the total length of the frame. Default is False.
+        verifyCrc (bool): check the crc of frames which carry one. Skipping the check
+            saves a pass over the whole frame, but a corrupted frame is then only
+            noticed when its data fails to decode. Default is True.
+    """
+    crc = None
+
+    _, ctrl, sec1, _, ns, length = _FRAME_HEADER_STRUCT.unpack_from(frameData)
+
+    dataEnd = _FRAME_HEADER_STRUCT.size + length
+    if len(frameData) < dataEnd:
+        raise struct.error("frame is shorter than its header says")
+    data = bytes(frameData[_FRAME_HEADER_STRUCT.size : dataEnd])
+    if ctrl & _FRAME_CTRL_CRC:
+        totalLen = dataEnd + _CRC_STRUCT.size
+        crc = _CRC_STRUCT.unpack_from(frameData, dataEnd)[0]
     else:
-        totalLen = struct.calcsize(headerFmt) + length
-        data = struct.unpack(
-            "<" + str(length) + "s", frameData[struct.calcsize(headerFmt) : totalLen]
-        )[0]
+        totalLen = dataEnd
 
     # check crc
-    if crc is not None:
-        crcCalc = zlib.crc32(frameData[: -struct.calcsize("<" + crcFmt)]) % (
-            1 << 32
-        )  # unsigned crc32
+    if crc is not None and verifyCrc:
+        # the crc covers header and data, computed on a view to not copy them
+        crcCalc = zlib.crc32(memoryview(frameData)[:dataEnd])
         if crcCalc != crc:
             raise FrameError("CRC32 not validated")
 
@@ -246,67 +439,134 @@ def rscpFrameDecode(frameData: bytes, returnFrameLen: bool = False):
         return data, timestamp
 
 
+def _decodeNone(data: bytes, curByte: int, length: int) -> Tuple[Any, int]:
+    return None, curByte
+
+
+def _decodeTimestamp(data: bytes, curByte: int, length: int) -> Tuple[Any, int]:
+    hiword, loword, ms = _TIMESTAMP_STRUCT.unpack_from(data, curByte)
+    # t = float((hiword << 32) + loword) + (float(ms)*1e-9) # this should work, but doesn't
+    val = float(hiword + loword) + (float(ms) * 1e-9)  # this seems to be correct
+    return val, curByte + _TIMESTAMP_STRUCT.size
+
+
+def _decodeVarSize(data: bytes, curByte: int, length: int) -> Tuple[Any, int]:
+    valueEnd = curByte + length
+    if len(data) < valueEnd:
+        raise struct.error("data is shorter than its header says")
+    return data[curByte:valueEnd], valueEnd
+
+
+def _decodeCString(data: bytes, curByte: int, length: int) -> Tuple[Any, int]:
+    valueEnd = curByte + length
+    if len(data) < valueEnd:
+        raise struct.error("data is shorter than its header says")
+    # return string instead of bytes
+    # ignore none utf-8 bytes
+    return data[curByte:valueEnd].decode("utf-8", "ignore"), valueEnd
+
+
+# value decoders of the types which are not in _FIXED_SIZE_VALUE_STRUCTS, keyed
+# by the type value like _ENCODERS; containers are handled by rscpDecode itself
+_DECODERS: Dict[int, Callable[[bytes, int, int], Tuple[Any, int]]] = {
+    RscpType.NoneType.value: _decodeNone,
+    RscpType.Timestamp.value: _decodeTimestamp,
+    **{rscptype.value: _decodeVarSize for rscptype in packFmtDict_VarSize},
+    RscpType.CString.value: _decodeCString,
+}
+
+
 def rscpDecode(
     data: bytes,
+    offset: int = 0,
 ) -> Tuple[Tuple[str | int | RscpTag, str | int | RscpType, Any], int]:
-    """Decodes RSCP data."""
-    headerFmt = (
-        "<IBH"  # format of header: little-endian, Uint32 tag, Uint8 type, Uint16 length
-    )
-    headerSize = struct.calcsize(headerFmt)
-
-    magicCheckFmt = ">H"
-    magic = struct.unpack(magicCheckFmt, data[: struct.calcsize(magicCheckFmt)])[0]
-    if magic == 0xE3DC:
-        # we have a frame: decode it
-        # print "Decoding frame in rscpDecode"
-        return rscpDecode(rscpFrameDecode(data)[0])
-
-    # decode header
-    hexTag, hexType, length = struct.unpack(
-        headerFmt, data[: struct.calcsize(headerFmt)]
-    )
-    # print (hex(hexTag), hex(hexType), length, data[struct.calcsize(headerFmt):])
-    strTag = getStrRscpTag(hexTag)
-    strType = getStrRscpType(hexType)
-    type_ = getRscpType(hexType)
-
-    if type_ == RscpType.Container:
-        # this is a container: parse the inside
-        dataList: List[Tuple[str | int | RscpTag, str | int | RscpType, Any]] = []
-        curByte = headerSize
-        while curByte < headerSize + length:
-            innerData, usedLength = rscpDecode(data[curByte:])
-            curByte += usedLength
-            dataList.append(innerData)
-        return (strTag, strType, dataList), curByte
-    elif type_ == RscpType.Timestamp:
-        fmt = "<iii"
-        hiword, loword, ms = struct.unpack(
-            fmt, data[headerSize : headerSize + struct.calcsize(fmt)]
-        )
-        # t = float((hiword << 32) + loword) + (float(ms)*1e-9) # this should work, but doesn't
-        t = float(hiword + loword) + (float(ms) * 1e-9)  # this seems to be correct
-        return (strTag, strType, t), headerSize + struct.calcsize(fmt)
-    elif type_ == RscpType.NoneType:
-        return (strTag, strType, None), headerSize
-    elif type_ in packFmtDict_FixedSize:
-        fmt = "<" + packFmtDict_FixedSize[type_]
-    elif type_ in packFmtDict_VarSize:
-        fmt = "<" + str(length) + packFmtDict_VarSize[type_]
-    else:
-        raise Exception("data can't be decoded")
+    """Decodes RSCP data.
 
-    val = struct.unpack(fmt, data[headerSize : headerSize + struct.calcsize(fmt)])[0]
+    Nested containers are decoded with an explicit stack instead of recursion.
 
-    if type_ == RscpType.Error:
-        val = getStrRscpError(int.from_bytes(val, "little"))
-    elif isinstance(val, bytes) and type_ == RscpType.CString:
-        # return string instead of bytes
-        # ignore none utf-8 bytes
-        val = val.decode("utf-8", "ignore")
-
-    if DEBUG_DICT["print_rscp"]:
-        print("<", strTag, strType, val)
+    Args:
+        data (bytes): the buffer holding the RSCP data, only bytes are accepted. It
+            is read at the offset, the data before and after it is not copied.
+        offset (int): position in the buffer where the data starts. Default is 0.
 
-    return (strTag, strType, val), headerSize + struct.calcsize(fmt)
+    Returns:
+        tuple: the decoded message and the number of bytes consumed from the offset.
+            ByteArray and BitField values are bytes copied out of the buffer, not
+            views into it.
+    """
+    # the loop runs once per field, bind what it uses to locals to save the
+    # global and attribute lookups
+    headerSize = _HEADER_STRUCT.size
+    unpackMagic = _MAGIC_STRUCT.unpack_from
+    unpackHeader = _HEADER_STRUCT.unpack_from
+    getTagName = _TAG_NAMES_BY_VALUE.get
+    getTypeAndName = _TYPES_BY_VALUE.get
+    getFixedSizeStruct = _FIXED_SIZE_VALUE_STRUCTS.get
+    getDecoder = _DECODERS.get
+    containerType = RscpType.Container
+    errorType = RscpType.Error
+
+    # containers are decoded with an explicit stack instead of recursion: the values
+    # are appended to the list of the innermost open container, which is closed
+    # as soon as its content has been read
+    decoded: List[Tuple[str | int | RscpTag, str | int | RscpType, Any]] = []
+    dataList = decoded  # receives the single top level message
+    dataListEnd = offset
+    openContainers: List[
+        Tuple[List[Tuple[str | int | RscpTag, str | int | RscpType, Any]], int]
+    ] = []
+    curByte = offset
+    while True:
+        magic = unpackMagic(data, curByte)[0]
+        if magic == 0xE3DC:
+            # we have a frame: decode it
+            # print "Decoding frame in rscpDecode"
+            innerData, usedLength = rscpDecode(rscpFrameDecode(data[curByte:])[0])
+            dataList.append(innerData)
+            curByte += usedLength
+        else:
+            # decode header
+            hexTag, hexType, length = unpackHeader(data, curByte)
+            strTag = getTagName(hexTag)
+            typeAndName = getTypeAndName(hexType)
+            if strTag is None or typeAndName is None:
+                # unknown to this library, raise the same error as the conversion functions
+                strTag = getStrRscpTag(hexTag)
+                typeAndName = getRscpType(hexType), getStrRscpType(hexType)
+            type_, strType = typeAndName
+            curByte += headerSize
+
+            if type_ is containerType:
+                # this is a container: parse the inside
+                containerList: List[
+                    Tuple[str | int | RscpTag, str | int | RscpType, Any]
+                ] = []
+                dataList.append((strTag, strType, containerList))
+                openContainers.append((dataList, dataListEnd))
+                dataList, dataListEnd = containerList, curByte + length
+            else:
+                val: Any
+                # the value is picked by the type value from the header, the fixed
+                # size types are the most common ones and are unpacked inline
+                valueStruct = getFixedSizeStruct(hexType)
+                if valueStruct is not None:
+                    val = valueStruct.unpack_from(data, curByte)[0]
+                    curByte += valueStruct.size
+                else:
+                    decodeValue = getDecoder(hexType)
+                    if decodeValue is None:
+                        raise Exception("data can't be decoded")
+                    val, curByte = decodeValue(data, curByte, length)
+
+                if type_ is errorType:
+                    val = getStrRscpError(int.from_bytes(val, "little"))
+
+                if DEBUG_DICT["print_rscp"]:
+                    print("<", strTag, strType, val)
+
+                dataList.append((strTag, strType, val))
+
+        while openContainers and curByte >= dataListEnd:
+            dataList, dataListEnd = openContainers.pop()
+        if not openContainers:
+            return decoded[0], curByte - offset
@@ -3657,6 +3657,33 @@ def getRscpTag(tag: int | str | RscpTag) -> RscpTag:
     return tag
 
 
+_RSCP_TAGS_BY_NAME = RscpTag.__members__
+
+
+def getRscpTagOrNone(tag: int | str | RscpTag) -> RscpTag | None:
+    """Convert a tag to its RscpTag enumeration equivalent, without raising.
+
+    Args:
+        tag (int | str | RscpTag): The tag to be converted.
+            - If int, it's assumed to be the tag value.
+            - If str, it's assumed to be the tag name.
+            - If RscpTag, it is returned as is.
+
+    Returns:
+        RscpTag | None: The corresponding RscpTag enumeration object, or None if the
+            tag is unknown.
+    """
+    if isinstance(tag, str):
+        return _RSCP_TAGS_BY_NAME.get(tag)
+    elif isinstance(tag, int):
+        try:
+            return RscpTag(tag)
+        except ValueError:
+            return None
+
+    return tag
+
+
 def getHexRscpTag(tag: int | str | RscpTag) -> int:
     """Convert a tag to its hexadecimal value representation.
 
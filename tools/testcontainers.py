@@ -1,11 +1,78 @@
 """A simple python script to test the e3dc module with various python versions in docker."""
 
 import argparse
+import io
 import json
+import sys
+import tarfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import docker
 
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+_OUTPUT_LOCK = threading.Lock()
+
+
+def build_test_image(client, version, module="local"):
+    """Build an image for the tests with their dependencies installed.
+
+    For local tests only the files pip needs to resolve the dependencies are part of
+    the build, so the cached image is reused until the dependencies change and only
+    the package itself is installed in the container.
+    """
+    dockerfile = "FROM python:" + version + "\nENV PIP_DISABLE_PIP_VERSION_CHECK=1\n"
+    context = io.BytesIO()
+    with tarfile.open(fileobj=context, mode="w") as tar:
+        if module == "local":
+            for name in ["pyproject.toml", "README.md", "e3dc/__init__.py"]:
+                tar.add(
+                    str(_REPO_ROOT / name),
+                    arcname="pye3dc/" + name,
+                    filter=_reset_tarinfo,
+                )
+            dockerfile += (
+                "COPY pye3dc /pye3dc\n"
+                "RUN pip install /pye3dc[develop] && pip uninstall -y pye3dc\n"
+            )
+            tag = "python-e3dc-test:" + version
+        else:
+            dockerfile += "RUN pip install pye3dc=={}\n".format(module)
+            tag = "python-e3dc-test:{}-{}".format(version, module)
+        dockerfileData = dockerfile.encode()
+        tarinfo = tarfile.TarInfo("Dockerfile")
+        tarinfo.size = len(dockerfileData)
+        tar.addfile(tarinfo, io.BytesIO(dockerfileData))
+    context.seek(0)
+    client.images.build(fileobj=context, custom_context=True, tag=tag, rm=True)
+    return tag
+
+
+def _reset_tarinfo(tarinfo):
+    """Drop the file metadata which would needlessly invalidate the build cache."""
+    tarinfo.mtime = 0
+    tarinfo.uid = tarinfo.gid = 0
+    tarinfo.uname = tarinfo.gname = ""
+    return tarinfo
+
+
+def _write_bytes(stream, data):
+    """Write bytes to a text stream, after the text already printed to it."""
+    stream.flush()
+    stream.buffer.write(data)
+    stream.buffer.flush()
+
+
+def _write_lines(stream, data, prefix):
+    """Write the complete lines of data with the prefix, return the incomplete rest."""
+    *lines, rest = data.split(b"\n")
+    if lines:
+        # the versions write at the same time, a line must not be split up
+        with _OUTPUT_LOCK:
+            _write_bytes(stream, b"".join(prefix + line + b"\n" for line in lines))
+    return rest
+
 
 class Testcontainers:
     """A class to run commands in a python container."""
@@ -15,6 +82,7 @@ class Testcontainers:
 
     def __init__(
         self,
+        client,
         ipAddress,
         username,
         password,
@@ -22,53 +90,96 @@ class Testcontainers:
         key="",
         serialNumber="",
         version="3.8",
+        module="local",
+        refreshImages=False,
+        reuse=False,
     ):
         """The init method for Testcontainers."""
-        client = docker.from_env()
         self.version = version
         image_name = "python:" + version
         container_name = "python-e3dc-" + version
-        client.images.pull(image_name)
+        # only go to the registry if the image is missing or a refresh was requested
+        if refreshImages:
+            client.images.pull(image_name)
+        else:
+            try:
+                client.images.get(image_name)
+            except docker.errors.ImageNotFound:
+                client.images.pull(image_name)
+        test_image_name = build_test_image(client, version, module)
+        # the environment is passed to each command, so a reused container works
+        # with the current arguments
+        self.environment = {
+            "IPADDRESS": ipAddress,
+            "USERNAME": username,
+            "PASSWORD": password,
+            "KEY": key,
+            "SERIALNUMBER": serialNumber,
+            "CONFIG": configuration,
+        }
         try:
-            client.containers.get(container_name).remove(force=True)
+            container = client.containers.get(container_name)
         except docker.errors.NotFound:
-            pass
-        self.container = client.containers.run(
-            image_name,
-            name=container_name,
-            stdin_open=True,
-            remove=True,
-            detach=True,
-            volumes=[str(Path(__file__).resolve().parents[1]) + ":/pye3dc"],
-            working_dir="/pye3dc",
-            environment={
-                "IPADDRESS": ipAddress,
-                "USERNAME": username,
-                "PASSWORD": password,
-                "KEY": key,
-                "SERIALNUMBER": serialNumber,
-                "CONFIG": configuration,
-            },
-        )
+            container = None
+        if (
+            reuse
+            and container is not None
+            and container.status == "running"
+            and container.attrs["Image"] == client.images.get(test_image_name).id
+        ):
+            self.container = container
+        else:
+            if container is not None:
+                container.remove(force=True)
+            self.container = client.containers.run(
+                test_image_name,
+                name=container_name,
+                stdin_open=True,
+                remove=True,
+                detach=True,
+                volumes=[
+                    str(_REPO_ROOT) + ":/pye3dc",
+                    # shared by all versions. The dependencies are part of the image,
+                    # this only saves the setuptools download for the isolated build
+                    # of the package
+                    str(Path.home() / ".cache" / "pye3dc-pip") + ":/root/.cache/pip",
+                ],
+                working_dir="/pye3dc",
+            )
 
-    def exec_cmd_stream(self, command, verbose=True):
-        """Execute a command and stream output."""
-        exec_id = self.container.client.api.exec_create(self.container.id, command)
-        stream = self.container.client.api.exec_start(exec_id, stream=True)
-        for data in stream:
+    def exec_cmd(self, command, verbose=True, prefix=b""):
+        """Execute a command, stream its output and validate return code.
+
+        The output is printed while it arrives. With a prefix it is printed line by
+        line, each line starting with the prefix, so the output of commands running
+        in parallel can be told apart.
+        """
+        exec_id = self.container.client.api.exec_create(
+            self.container.id, command, environment=self.environment
+        )
+        stream = self.container.client.api.exec_start(exec_id, stream=True, demux=True)
+        # the incomplete last line of each stream, waiting for the rest of it
+        rests = {sys.stdout: b"", sys.stderr: b""}
+        for stdout, stderr in stream:
             if verbose:
-                print(data.decode(), end="")
+                # written as received, decoding could split a character between chunks
+                for target, data in [(sys.stdout, stdout), (sys.stderr, stderr)]:
+                    if not data:
+                        continue
+                    if prefix:
+                        rests[target] = _write_lines(
+                            target, rests[target] + data, prefix
+                        )
+                    else:
+                        _write_bytes(target, data)
+        for target, rest in rests.items():
+            if rest:
+                _write_lines(target, rest + b"\n", prefix)
         result = self.container.client.api.exec_inspect(exec_id)["ExitCode"]
         if result != 0:
-            exit(1)
-
-    def exec_cmd(self, command, verbose=True):
-        """Execute a command and validate return code."""
-        result, output = self.container.exec_run(cmd=command)
-        if verbose:
-            print(output.decode())
-        if result != 0:
-            exit(1)
+            # raised instead of exiting, so the other versions can finish and
+            # clean up their containers
+            raise RuntimeError("command failed with exit code {}".format(result))
 
     def remove(self):
         """Remove the test container."""
@@ -95,6 +206,16 @@ parser.add_argument(
     action="store_true",
     help="use local E3DC module for test",
 )
+parser.add_argument(
+    "--refresh-images",
+    action="store_true",
+    help="pull the Python images even if they are available locally",
+)
+parser.add_argument(
+    "--reuse",
+    action="store_true",
+    help="keep the test containers and reuse them in the next run",
+)
 requiredNamed = parser.add_argument_group("required named arguments")
 requiredNamed.add_argument("-u", "--username", help="username of E3DC", required=True)
 requiredNamed.add_argument("-p", "--password", help="password of E3DC", required=True)
@@ -119,12 +240,13 @@ elif args["serialnumber"] is None and not (args["ipaddress"] and args["key"]):
     print("for local connection ipaddress and key are required")
     exit(2)
 
-args = vars(parser.parse_args())
 
-for version in json.loads(args["list"]):
+def run_tests(version):
+    """Run the tests for one Python version in its own container."""
     if args["verbose"]:
         print("Starting test on Python " + version + ":")
     testcontainers = Testcontainers(
+        client=client,
         ipAddress=args["ipaddress"],
         username=args["username"],
         password=args["password"],
@@ -132,24 +254,57 @@ for version in json.loads(args["list"]):
         configuration=args["configuration"],
         serialNumber=args["serialnumber"],
         version=version,
+        module=args["module"],
+        refreshImages=args["refresh_images"],
+        reuse=args["reuse"],
     )
-    cmd = "sh -c 'python tools/tests.py -u $USERNAME -p $PASSWORD -c $CONFIG"
+    # all steps run in a single exec, the output of the setup steps is only
+    # shown in verbose mode
+    quiet = "" if args["verbose"] else " >/dev/null"
+    # the versions run in parallel, their lines are told apart by the version
+    prefix = "[{}] ".format(version).encode() if len(versions) > 1 else b""
+    steps = []
+    cmd = "python tools/tests.py -u $USERNAME -p $PASSWORD -c $CONFIG"
     if args["module"] == "local":
-        testcontainers.exec_cmd_stream("pip install .[develop]", args["verbose"])
-        print("Running black, flake8, isort and pyright:")
-        testcontainers.exec_cmd_stream("tools/validate.sh", args["verbose"])
-    else:
-        testcontainers.exec_cmd_stream(
-            "pip install pye3dc=={}".format(args["module"]), args["verbose"]
+        # the dependencies are part of the image, only the package is installed.
+        # The sources are shared by all containers, build from a private copy as
+        # setuptools writes build/ and *.egg-info into the source tree
+        steps.append(
+            "rm -rf /tmp/pye3dc && cp -r /pye3dc /tmp/pye3dc"
+            " && pip install --no-deps /tmp/pye3dc" + quiet
         )
+        steps.append("echo Running black, flake8, isort and pyright:")
+        steps.append("tools/validate.sh" + quiet)
+    else:
+        # the released module is part of the image
         cmd = cmd + " -m"
     if args["key"]:
         cmd = cmd + " -i $IPADDRESS -k $KEY"
     else:
         cmd = cmd + " -s $SERIALNUMBER"
     if args["verbose"]:
-        cmd = cmd + " -v'"
-    else:
-        cmd = cmd + "'"
-    testcontainers.exec_cmd_stream(cmd)
-    testcontainers.remove()
+        cmd = cmd + " -v"
+    steps.append(cmd)
+    try:
+        testcontainers.exec_cmd("sh -c '" + " && ".join(steps) + "'", prefix=prefix)
+    finally:
+        if not args["reuse"]:
+            testcontainers.remove()
+
+
+# the versions are independent and mostly wait for docker and the network,
+# so all of them run at the same time, each in its own container
+versions = json.loads(args["list"])
+# a single connection to the docker daemon is shared by all versions
+client = docker.from_env()
+failed = False
+with ThreadPoolExecutor(max_workers=max(1, len(versions))) as executor:
+    futures = [executor.submit(run_tests, version) for version in versions]
+    for version, future in zip(versions, futures):
+        try:
+            future.result()
+        except Exception as e:
+            print("Test on Python {} failed: {}".format(version, e))
+            failed = True
+if failed:
+    exit(1)
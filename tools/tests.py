@@ -2,9 +2,14 @@
 
 import argparse
 import json
-import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 def json_serial(obj):
     """JSON serializer for objects not serializable by default json code."""
@@ -13,12 +18,38 @@ def json_serial(obj):
     raise TypeError("Type %s not serializable" % type(obj))
 
 
+def dumpJson(obj):
+    """Serialize an object to indented json, with orjson if it is installed."""
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            default=json_serial,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+        ).decode()
+    return json.dumps(obj, indent=2, default=json_serial)
+
+
+def redactSerials(obj):
+    """Return a copy of an object with the values of its serial keys redacted."""
+    if isinstance(obj, dict):
+        redacted = {}
+        for key, value in obj.items():
+            value = redactSerials(value)
+            if isinstance(key, str) and key.startswith("serial"):
+                if isinstance(value, str):
+                    value = "redacted"
+                elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                    value = 0
+            redacted[key] = value
+        return redacted
+    if isinstance(obj, (list, tuple)):
+        return [redactSerials(item) for item in obj]
+    return obj
+
+
 def printJson(obj):
     """Print a json object with a datetime obect."""
-    output = json.dumps(obj, indent=2, default=json_serial)
-    output = re.sub(r"(.*\"serial.*\": \")(.*)(\",*)", r"\1redacted\3", output, re.M)
-    output = re.sub(r"(.*\"serial.*\": )(\d+)(,*)", r"\g<1>0\g<3>", output, re.M)
-    print(output)
+    print(dumpJson(redactSerials(obj)))
 
 
 parser = argparse.ArgumentParser(description="E3DC tests")
@@ -111,10 +142,24 @@ methods = [
     "get_power_settings",
 ]
 
-for method in methods:
-    if args["verbose"]:
-        print("\n" + method + "():")
-    method = getattr(e3dc_obj, method)
-    printJson(method(keepAlive=True))
+# bound up front, so a misspelled method fails before any request is sent
+boundMethods = [(method, getattr(e3dc_obj, method)) for method in methods]
+
+# the connection serves one request at a time, so the methods are called one after
+# the other by a single worker while the main thread prints the previous result
+with ThreadPoolExecutor(max_workers=1) as executor:
+    futures = [
+        (method, executor.submit(boundMethod, keepAlive=True))
+        for method, boundMethod in boundMethods
+    ]
+    try:
+        for method, future in futures:
+            if args["verbose"]:
+                print("\n" + method + "():")
+            printJson(future.result())
+    finally:
+        # don't call the remaining methods if one of them failed
+        for _, future in futures:
+            future.cancel()
 
 e3dc_obj.disconnect()